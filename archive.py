@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from database import db
+import argparse
+
+# Архивация решенных рекламаций в холодное хранилище.
+# За один шаг пачка строк удаляется из complaints, копируется
+# в complaints_archive и добавляется в агрегаты complaint_archive_stats.
+# Каждая пачка - отдельная короткая транзакция, а SKIP LOCKED
+# пропускает строки, которые сейчас редактируются, поэтому таблица
+# не блокируется надолго. Пачка берется в порядке индекса
+# ix_complaints_status_date, поэтому ее выборка не зависит от размера
+# накопленного хвоста
+
+DEFAULT_ARCHIVE_AFTER_DAYS = 180
+DEFAULT_BATCH_SIZE = 1000
+
+ARCHIVE_BATCH_SQL = text("""
+    WITH moved AS (
+        DELETE FROM complaints
+        WHERE id IN (
+            SELECT id
+            FROM complaints
+            WHERE status = 'resolved' AND complaint_date < :cutoff
+            ORDER BY complaint_date
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING *
+    ),
+    archived AS (
+        INSERT INTO complaints_archive (
+            id, complaint_number, product_id, reason_id, customer_name,
+            customer_region, complaint_date, description, status,
+            created_at, archived_at
+        )
+        SELECT
+            id, complaint_number, product_id, reason_id, customer_name,
+            customer_region, complaint_date, description, status,
+            created_at, NOW()
+        FROM moved
+        RETURNING 1
+    ),
+    stats AS (
+        INSERT INTO complaint_archive_stats (month, product_id, reason_id, count)
+        SELECT
+            TO_CHAR(complaint_date, 'YYYY-MM'), product_id, reason_id, COUNT(*)
+        FROM moved
+        GROUP BY TO_CHAR(complaint_date, 'YYYY-MM'), product_id, reason_id
+        ON CONFLICT (month, product_id, reason_id)
+        DO UPDATE SET count = complaint_archive_stats.count + EXCLUDED.count
+        RETURNING 1
+    )
+    SELECT COUNT(*) FROM moved
+""")
+
+
+def archive_resolved_complaints(older_than_days=DEFAULT_ARCHIVE_AFTER_DAYS,
+                                batch_size=DEFAULT_BATCH_SIZE):
+    """Перенести решенные рекламации старше N дней в архив (пачками)"""
+    if older_than_days < 1:
+        raise ValueError('Срок архивации должен быть не меньше 1 дня')
+    if batch_size < 1:
+        raise ValueError('Размер пачки должен быть не меньше 1')
+
+    cutoff = datetime.now() - timedelta(days=older_than_days)
+    print(f"Архивация решенных рекламаций до {cutoff:%Y-%m-%d}...")
+
+    total = 0
+    while True:
+        try:
+            moved = db.session.execute(ARCHIVE_BATCH_SQL, {
+                'cutoff': cutoff,
+                'batch_size': batch_size
+            }).scalar()
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        total += moved
+        if moved:
+            print(f"Перенесено в архив: {moved} (всего {total})")
+
+        # Неполная пачка не означает конец: часть строк могла быть
+        # пропущена из-за SKIP LOCKED, поэтому идем до пустой пачки
+        if moved == 0:
+            break
+
+    print(f"Архивация завершена. Перенесено записей: {total}")
+    return total
+
+
+if __name__ == '__main__':
+    from app import app
+
+    parser = argparse.ArgumentParser(
+        description='Архивация решенных рекламаций')
+    parser.add_argument('--days', type=int, default=DEFAULT_ARCHIVE_AFTER_DAYS,
+                        help='Возраст рекламации в днях для переноса в архив')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if args.days < 1:
+        parser.error('--days должен быть не меньше 1')
+    if args.batch_size < 1:
+        parser.error('--batch-size должен быть не меньше 1')
+
+    with app.app_context():
+        archive_resolved_complaints(args.days, args.batch_size)
@@ -0,0 +1,241 @@
+import asyncio
+import csv
+import io
+import json
+import contextlib
+from datetime import datetime
+import uvicorn
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+from async_database import (
+    engine,
+    get_all_complaints_async,
+    search_products_async,
+    get_reasons_payload_async,
+    get_dashboard_stats_async,
+    get_complaints_by_reason_async,
+    get_complaints_by_month_async,
+    get_complaints_by_product_async,
+    get_complaints_by_region_async,
+    get_archived_complaints_async,
+    stream_complaints
+)
+from charts import (
+    top_reasons_chart,
+    monthly_trend_chart,
+    products_chart,
+    regions_chart,
+    error_chart
+)
+
+# Асинхронный режим для API (ASGI).
+# Запускается отдельно от основного Flask-приложения:
+#   uvicorn async_app:app --host 0.0.0.0 --port 8081 --workers 2
+# Пока запрос ждет PostgreSQL, поток не блокируется, поэтому один
+# процесс обслуживает много одновременных и долгих соединений
+
+# Интервал обновления статистики для живого дашборда (секунд)
+STATS_STREAM_INTERVAL = 5
+
+# Время кэширования справочников в браузере (секунд)
+REASONS_CACHE_MAX_AGE = 300
+
+
+def _parse_date(value):
+    """Разобрать дату YYYY-MM-DD из параметра запроса (None, если не задана)"""
+    return datetime.strptime(value, '%Y-%m-%d') if value else None
+
+
+def _int_param(request, name, default):
+    """Целочисленный параметр запроса (default, если не задан или некорректен)"""
+    try:
+        return int(request.query_params.get(name, default))
+    except ValueError:
+        return default
+
+
+def _chart_response(chart):
+    """Ответ с JSON графика Plotly"""
+    return Response(chart, media_type='application/json')
+
+
+async def api_complaints(request):
+    """API для получения рекламаций"""
+    complaints = await get_all_complaints_async()
+    return JSONResponse([c.to_api_dict() for c in complaints])
+
+
+async def api_products_search(request):
+    """API для автодополнения товаров по артикулу или названию"""
+    query = request.query_params.get('q', '')
+    limit = max(1, min(_int_param(request, 'limit', 20), 50))
+
+    products = await search_products_async(query, limit=limit)
+    return JSONResponse([p.to_dict() for p in products])
+
+
+async def api_reasons(request):
+    """API для справочника причин возврата (кэш + gzip)"""
+    payload, payload_gzip, etag = await get_reasons_payload_async()
+
+    headers = {
+        'Vary': 'Accept-Encoding',
+        'Cache-Control': f'public, max-age={REASONS_CACHE_MAX_AGE}'
+    }
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        body = payload_gzip
+        headers['Content-Encoding'] = 'gzip'
+        etag = f"{etag}-gzip"
+    else:
+        body = payload
+    headers['ETag'] = f'"{etag}"'
+
+    if request.headers.get('If-None-Match') == headers['ETag']:
+        return Response(status_code=304, headers=headers)
+
+    return Response(body, media_type='application/json', headers=headers)
+
+
+async def chart_top_reasons(request):
+    """График топ причин возвратов"""
+    data = await get_complaints_by_reason_async(limit=10)
+
+    if not data:
+        return JSONResponse({'error': 'Нет данных'})
+
+    # Построение графика нагружает CPU, поэтому выполняется вне event loop
+    return _chart_response(await run_in_threadpool(top_reasons_chart, data))
+
+
+async def chart_monthly_trend(request):
+    """График по месяцам"""
+    data = await get_complaints_by_month_async()
+
+    if not data:
+        return JSONResponse({'error': 'Нет данных'})
+
+    return _chart_response(await run_in_threadpool(monthly_trend_chart, data))
+
+
+async def chart_products(request):
+    """График по продуктам"""
+    try:
+        data = await get_complaints_by_product_async(limit=10)
+        return _chart_response(await run_in_threadpool(products_chart, data))
+
+    except Exception as e:
+        print(f"Ошибка в chart_products: {e}")
+        return _chart_response(error_chart(e))
+
+
+async def chart_regions(request):
+    """Тепловая карта рекламаций по регионам (регион x неделя или причина)"""
+    by = request.query_params.get('by', 'week')
+    if by not in ('week', 'reason'):
+        return JSONResponse(
+            {'error': 'Параметр by должен быть week или reason'}, 400)
+
+    try:
+        date_from = _parse_date(request.query_params.get('date_from'))
+        date_to = _parse_date(request.query_params.get('date_to'))
+    except ValueError:
+        return JSONResponse(
+            {'error': 'Дата должна быть в формате YYYY-MM-DD'}, 400)
+
+    data = await get_complaints_by_region_async(
+        by,
+        date_from.date() if date_from else None,
+        date_to.date() if date_to else None
+    )
+
+    if not data:
+        return JSONResponse({'error': 'Нет данных'})
+
+    return _chart_response(await run_in_threadpool(regions_chart, data, by))
+
+
+async def api_archive_complaints(request):
+    """API для получения рекламаций из архива"""
+    try:
+        date_from = _parse_date(request.query_params.get('date_from'))
+        date_to = _parse_date(request.query_params.get('date_to'))
+    except ValueError:
+        return JSONResponse(
+            {'error': 'Дата должна быть в формате YYYY-MM-DD'}, 400)
+
+    limit = max(1, min(_int_param(request, 'limit', 100), 1000))
+    offset = max(0, _int_param(request, 'offset', 0))
+
+    complaints = await get_archived_complaints_async(
+        date_from, date_to, limit, offset)
+    return JSONResponse([c.to_api_dict() for c in complaints])
+
+
+async def api_stats(request):
+    """API для статистики"""
+    stats = await get_dashboard_stats_async()
+    return JSONResponse(stats)
+
+
+async def api_stats_stream(request):
+    """Живой поток статистики для дашборда (Server-Sent Events)"""
+    async def event_stream():
+        while not await request.is_disconnected():
+            stats = await get_dashboard_stats_async()
+            yield f"data: {json.dumps(stats, ensure_ascii=False)}\n\n"
+            await asyncio.sleep(STATS_STREAM_INTERVAL)
+
+    return StreamingResponse(event_stream(), media_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache'})
+
+
+async def api_complaints_export(request):
+    """Потоковая выгрузка всех рекламаций в CSV"""
+    async def csv_stream():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(['id', 'number', 'product', 'reason',
+                         'customer', 'date', 'status'])
+
+        async for batch in stream_complaints():
+            for complaint in batch:
+                writer.writerow(complaint.to_api_dict().values())
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        yield buffer.getvalue()
+
+    return StreamingResponse(csv_stream(), media_type='text/csv', headers={
+        'Content-Disposition': 'attachment; filename="complaints.csv"'
+    })
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    yield
+    # Закрываем пул соединений при остановке сервера
+    await engine.dispose()
+
+
+routes = [
+    Route('/api/complaints', api_complaints),
+    Route('/api/complaints/export', api_complaints_export),
+    Route('/api/products/search', api_products_search),
+    Route('/api/reasons', api_reasons),
+    Route('/api/charts/top_reasons', chart_top_reasons),
+    Route('/api/charts/monthly_trend', chart_monthly_trend),
+    Route('/api/charts/products', chart_products),
+    Route('/api/charts/regions', chart_regions),
+    Route('/api/archive/complaints', api_archive_complaints),
+    Route('/api/stats', api_stats),
+    Route('/api/stats/stream', api_stats_stream),
+]
+
+app = Starlette(routes=routes, lifespan=lifespan)
+
+
+if __name__ == '__main__':
+    uvicorn.run(app, host='0.0.0.0', port=8081)
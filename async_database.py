@@ -0,0 +1,150 @@
+import asyncio
+import os
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from database import (
+    DATABASE_URI,
+    Complaint,
+    ReturnReason,
+    COMPLAINTS_BY_REASON_SQL,
+    COMPLAINTS_BY_MONTH_SQL,
+    COMPLAINTS_BY_PRODUCT_SQL,
+    get_dashboard_count_queries,
+    fill_top_reason,
+    build_product_search_query,
+    build_archived_complaints_query,
+    build_region_cube_query,
+    get_cached_reasons_payload,
+    cache_reasons
+)
+
+# Асинхронный доступ к БД: драйвер asyncpg + пул соединений SQLAlchemy.
+# Запросы берутся из database.py, поэтому результаты совпадают
+# с синхронным режимом
+ASYNC_DATABASE_URI = make_url(DATABASE_URI).set(drivername='postgresql+asyncpg')
+
+# Один запрос /api/stats занимает 5 соединений (4 счетчика + топ причина),
+# поэтому пул на процесс должен быть около 5 x число одновременных запросов.
+# Сумма по всем процессам не должна превышать max_connections в PostgreSQL
+# (по умолчанию 100); запросы сверх пула ждут свободное соединение
+ASYNC_DB_POOL_SIZE = int(os.environ.get('ASYNC_DB_POOL_SIZE', 25))
+ASYNC_DB_MAX_OVERFLOW = int(os.environ.get('ASYNC_DB_MAX_OVERFLOW', 15))
+
+engine = create_async_engine(
+    ASYNC_DATABASE_URI,
+    pool_size=ASYNC_DB_POOL_SIZE,
+    max_overflow=ASYNC_DB_MAX_OVERFLOW,
+    pool_pre_ping=True
+)
+async_session = async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def _fetch_scalar(query, params=None):
+    """Выполнить запрос на отдельном соединении из пула и вернуть одно значение"""
+    async with engine.connect() as conn:
+        result = await conn.execute(query, params or {})
+        return result.scalar()
+
+
+async def _fetch_one(query, params=None):
+    """Выполнить запрос на отдельном соединении из пула и вернуть одну строку"""
+    async with engine.connect() as conn:
+        result = await conn.execute(query, params or {})
+        return result.fetchone()
+
+
+async def _fetch_all(query, params=None):
+    """Выполнить запрос и вернуть все строки"""
+    async with engine.connect() as conn:
+        result = await conn.execute(query, params or {})
+        return result.fetchall()
+
+
+async def get_all_complaints_async(limit=100):
+    """Получить все рекламации"""
+    async with async_session() as session:
+        result = await session.scalars(
+            select(Complaint)
+            .order_by(Complaint.complaint_date.desc())
+            .limit(limit)
+        )
+        return result.all()
+
+
+async def search_products_async(query, limit=20):
+    """Поиск товаров по началу артикула или названия (для автодополнения)"""
+    search_query = build_product_search_query(query, limit)
+    if search_query is None:
+        return []
+
+    async with async_session() as session:
+        result = await session.scalars(search_query)
+        return result.all()
+
+
+async def get_reasons_payload_async():
+    """Получить справочник причин в виде (json, gzip, etag) из кэша"""
+    payload = get_cached_reasons_payload()
+    if payload is None:
+        async with async_session() as session:
+            reasons = await session.scalars(
+                select(ReturnReason).order_by(ReturnReason.name))
+            payload = cache_reasons([r.to_dict() for r in reasons])
+
+    return payload
+
+
+async def get_complaints_by_reason_async(limit=10):
+    """Получить количество рекламаций по причинам"""
+    return await _fetch_all(COMPLAINTS_BY_REASON_SQL, {'limit': limit})
+
+
+async def get_complaints_by_month_async():
+    """Получить рекламации по месяцам"""
+    return await _fetch_all(COMPLAINTS_BY_MONTH_SQL)
+
+
+async def get_complaints_by_product_async(limit=10):
+    """Получить количество рекламаций по продуктам"""
+    return await _fetch_all(COMPLAINTS_BY_PRODUCT_SQL, {'limit': limit})
+
+
+async def get_complaints_by_region_async(by, date_from=None, date_to=None):
+    """Получить данные куба регионов (регион x неделя или причина)"""
+    return await _fetch_all(build_region_cube_query(by, date_from, date_to))
+
+
+async def get_archived_complaints_async(date_from=None, date_to=None,
+                                        limit=100, offset=0):
+    """Получить рекламации из архива (по дате рекламации)"""
+    query = build_archived_complaints_query(date_from, date_to, limit, offset)
+    async with async_session() as session:
+        result = await session.scalars(query)
+        return result.all()
+
+
+async def get_dashboard_stats_async():
+    """Получить статистику для дашборда (счетчики выполняются параллельно)"""
+    count_queries = get_dashboard_count_queries()
+
+    # Каждый счетчик выполняется на своем соединении из пула
+    results = await asyncio.gather(
+        *(_fetch_scalar(query) for query in count_queries.values()),
+        _fetch_one(COMPLAINTS_BY_REASON_SQL, {'limit': 1})
+    )
+
+    stats = dict(zip(count_queries.keys(), results[:-1]))
+    return fill_top_reason(stats, results[-1])
+
+
+async def stream_complaints(batch_size=1000):
+    """Потоково отдать все рекламации пачками (серверный курсор)"""
+    async with async_session() as session:
+        result = await session.stream_scalars(
+            select(Complaint)
+            .order_by(Complaint.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for batch in result.partitions(batch_size):
+            yield batch
@@ -0,0 +1,88 @@
+import argparse
+import math
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# Нагрузочный тест: сравнение синхронного (app.py) и асинхронного
+# (async_app.py) режимов по запросам в секунду и p99 задержки.
+# Оба сервера должны быть запущены заранее, с одинаковым числом процессов.
+# Синхронный режим запускается под WSGI-сервером, а не через python app.py
+# (dev-сервер с debug=True и перезагрузчиком дает заниженные цифры):
+#   gunicorn app:app -b 0.0.0.0:8080 --workers 2 --threads 16  # sync
+#   uvicorn async_app:app --port 8081 --workers 2               # async
+# Пример:
+#   python benchmark.py --path /api/stats -n 2000 -c 50
+# Для /api/stats асинхронный режим берет 5 соединений на запрос, поэтому
+# при -c 50 часть запросов ждет пул (ASYNC_DB_POOL_SIZE в async_database.py),
+# что увеличивает p99. Для честного сравнения поднимите размер пула
+# (и max_connections в PostgreSQL) или уменьшите -c
+
+
+def timed_request(url):
+    """Выполнить GET-запрос и вернуть (успех, задержка в секундах)"""
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            response.read()
+            ok = response.status == 200
+    except Exception:
+        ok = False
+    return ok, time.perf_counter() - start
+
+
+def percentile(values, percent):
+    """Перцентиль (nearest-rank) по отсортированному списку"""
+    if not values:
+        return 0.0
+    index = math.ceil(percent / 100 * len(values)) - 1
+    return values[max(index, 0)]
+
+
+def run_load(url, total, concurrency):
+    """Нагрузить эндпоинт и посчитать метрики"""
+    # Прогрев (соединения с БД, кэши)
+    for _ in range(min(concurrency, 10)):
+        timed_request(url)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(timed_request, [url] * total))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for ok, latency in results if ok)
+    errors = total - len(latencies)
+
+    # Учитываются только успешные ответы, иначе быстрые ошибки
+    # выглядели бы как высокая пропускная способность
+    return {
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'errors': errors
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Сравнение синхронного и асинхронного режимов API')
+    parser.add_argument('--sync-url', default='http://localhost:8080')
+    parser.add_argument('--async-url', default='http://localhost:8081')
+    parser.add_argument('--path', default='/api/stats')
+    parser.add_argument('-n', '--requests', type=int, default=1000)
+    parser.add_argument('-c', '--concurrency', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"Эндпоинт: {args.path}, запросов: {args.requests}, "
+          f"параллельно: {args.concurrency}")
+    print(f"{'Режим':<8}{'RPS':>10}{'p50, мс':>12}{'p99, мс':>12}{'Ошибки':>10}")
+
+    for mode, base_url in (('sync', args.sync_url), ('async', args.async_url)):
+        metrics = run_load(base_url + args.path,
+                           args.requests, args.concurrency)
+        print(f"{mode:<8}{metrics['rps']:>10.1f}{metrics['p50_ms']:>12.1f}"
+              f"{metrics['p99_ms']:>12.1f}{metrics['errors']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+import json
+import plotly
+import plotly.express as px
+import pandas as pd
+
+# Построение графиков Plotly по уже полученным из БД данным.
+# Общие для синхронного (app.py) и асинхронного (async_app.py) режимов
+
+
+def figure_to_json(fig):
+    """Сериализовать график Plotly в JSON"""
+    return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+
+
+def top_reasons_chart(data):
+    """График топ причин возвратов"""
+    df = pd.DataFrame(data, columns=['reason_name', 'count'])
+    fig = px.bar(
+        df,
+        x='reason_name',
+        y='count',
+        title='Топ причин возвратов',
+        color='count',
+        color_continuous_scale='blues'
+    )
+    fig.update_layout(
+        xaxis_title='Причина возврата',
+        yaxis_title='Количество',
+        showlegend=False
+    )
+
+    return figure_to_json(fig)
+
+
+def monthly_trend_chart(data):
+    """График по месяцам"""
+    df = pd.DataFrame(data, columns=['month', 'count'])
+    fig = px.line(
+        df,
+        x='month',
+        y='count',
+        title='Динамика рекламаций по месяцам',
+        markers=True
+    )
+    fig.update_layout(
+        xaxis_title='Месяц',
+        yaxis_title='Количество рекламаций'
+    )
+
+    return figure_to_json(fig)
+
+
+def products_chart(data):
+    """График по продуктам"""
+    if not data:
+        # Возвращаем пустой график
+        fig = px.bar(title='Нет данных по продуктам')
+        fig.update_layout(
+            xaxis_title='Продукт',
+            yaxis_title='Количество рекламаций'
+        )
+        return figure_to_json(fig)
+
+    df = pd.DataFrame(data, columns=['product_name', 'count'])
+    df = df.sort_values('count', ascending=False)
+
+    fig = px.bar(
+        df,
+        x='product_name',
+        y='count',
+        title='Рекламации по продуктам',
+        color='count',
+        color_continuous_scale='reds'
+    )
+    fig.update_layout(
+        xaxis_title='Продукт',
+        yaxis_title='Количество рекламаций',
+        showlegend=False,
+        xaxis_tickangle=-45
+    )
+
+    return figure_to_json(fig)
+
+
+def error_chart(error):
+    """Пустой график с текстом ошибки"""
+    return figure_to_json(px.bar(title=f'Ошибка: {str(error)}'))
+
+
+def regions_chart(data, by):
+    """Тепловая карта рекламаций по регионам (by: week или reason)"""
+    if by == 'week':
+        column, title = 'week', 'Рекламации по регионам и неделям'
+        axis_title = 'Неделя'
+    else:
+        column, title = 'reason', 'Рекламации по регионам и причинам'
+        axis_title = 'Причина возврата'
+
+    df = pd.DataFrame(data, columns=['region', column, 'count'])
+    heatmap = df.pivot(index='region', columns=column,
+                       values='count').fillna(0)
+    fig = px.imshow(
+        heatmap,
+        title=title,
+        color_continuous_scale='oranges',
+        aspect='auto'
+    )
+    fig.update_layout(
+        xaxis_title=axis_title,
+        yaxis_title='Регион'
+    )
+
+    return figure_to_json(fig)